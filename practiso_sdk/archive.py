@@ -1,49 +1,102 @@
+import functools
+import sys
+import weakref
 import xml.etree.ElementTree as Xml
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, UTC
 from io import BytesIO
-from typing import Callable, Any, IO
+from typing import Callable, Any, IO, Iterable
+from xml.sax.saxutils import escape, quoteattr
+
+try:
+    from lxml import etree as _LXml
+except ImportError:
+    _LXml = None
 
 NAMESPACE = 'http://schema.zhufucdev.com/practiso'
 
+# quiz parsing is pure Python, so threads only pay off without the GIL
+_PARALLEL_PARSING = not getattr(sys, '_is_gil_enabled', lambda: True)()
+
+USE_LXML = False
+"""
+Build and parse XML hierarchies with lxml instead of the standard library,
+if it is installed. lxml handles large archives considerably faster,
+but its elements take more memory, so this is left off by default.
+"""
+
+
+_MISSING = object()
+
 
 def _get_attribute_safe(element: Xml.Element, attr_name: str, convert: Callable[[str], Any] | None = None) -> Any:
-    if attr_name not in element.attrib:
+    value = element.get(attr_name, _MISSING)
+    if value is _MISSING:
         raise TypeError(f'Missing attribute {attr_name} in tag {element.tag}')
-    if convert:
-        return convert(element.attrib[attr_name])
-    else:
-        return element.attrib[attr_name]
+    return convert(value) if convert is not None else value
 
 
 def _get_simple_tag_name(element: Xml.Element):
-    rb = element.tag.index('}')
+    rb = element.tag.find('}')
     if rb < 0:
         return element.tag
     else:
         return element.tag[rb + 1:]
 
 
-def _namespace_extended(tag: str):
+@functools.cache
+def _namespace_extended(tag: str) -> str:
     return '{' + NAMESPACE + '}' + tag
 
 
+_TAG_ARCHIVE = sys.intern(_namespace_extended('archive'))
+_TAG_QUIZ = sys.intern(_namespace_extended('quiz'))
+_TAG_FRAMES = sys.intern(_namespace_extended('frames'))
+_TAG_DIMENSION = sys.intern(_namespace_extended('dimension'))
+_TAG_TEXT = sys.intern(_namespace_extended('text'))
+_TAG_IMAGE = sys.intern(_namespace_extended('image'))
+_TAG_OPTIONS = sys.intern(_namespace_extended('options'))
+_TAG_ITEM = sys.intern(_namespace_extended('item'))
+
+
+def _etree():
+    return _LXml if USE_LXML and _LXml is not None else Xml
+
+
+def _sub_element(parent: Xml.Element, tag: str, attrib: dict[str, str] | None = None) -> Xml.Element:
+    if isinstance(parent, Xml.Element):
+        return Xml.SubElement(parent, tag, attrib or {})
+    # lxml doesn't inherit the default namespace from plain tags
+    return _LXml.SubElement(parent, _namespace_extended(tag), attrib)
+
+
+def _format_start_tag(tag: str, attrib: dict[str, str] | None = None, empty: bool = False) -> str:
+    parts = ['<', tag]
+    if attrib:
+        for key, value in attrib.items():
+            parts += ' ', key, '=', quoteattr(value)
+    parts.append(' />' if empty else '>')
+    return ''.join(parts)
+
+
 class ArchiveFrame:
     """
     Abstraction of supported frames.
     """
+    __slots__ = ()
 
     def append_to_element(self, element: Xml.Element):
         pass
 
+    def write_xml(self, fp: IO[bytes]):
+        pass
+
     @staticmethod
     def parse_xml_element(element: Xml.Element) -> 'ArchiveFrame':
-        tag_name = _get_simple_tag_name(element)
-        if tag_name == 'text':
-            return Text.parse_xml_element(element)
-        elif tag_name == 'image':
-            return Image.parse_xml_element(element)
-        elif tag_name == 'options':
-            return Options.parse_xml_element(element)
+        parser = _FRAME_PARSERS.get(element.tag)
+        if parser is None:
+            raise TypeError(f'Unexpected tag {_get_simple_tag_name(element)}')
+        return parser(element)
 
     def __hash__(self):
         raise RuntimeError(f'Unimplemented method __hash__ for {type(self).__name__}')
@@ -52,65 +105,142 @@ class ArchiveFrame:
 class Text(ArchiveFrame):
     """
     Abstraction of a text frame.
+    Equal texts share the same instance, so its content is read-only.
     """
-    content: str
+    __slots__ = ('__content', '_hash', '__weakref__')
+    __pool: 'weakref.WeakValueDictionary[tuple[type, str], Text]' = weakref.WeakValueDictionary()
+    __content: str
+    _hash: int | None
+
+    def __new__(cls, content: str):
+        key = (cls, content)
+        instance = Text.__pool.get(key)
+        if instance is None:
+            instance = super().__new__(cls)
+            instance.__content = content
+            instance._hash = None
+            Text.__pool[key] = instance
+        return instance
+
+    def __getnewargs__(self):
+        return self.__content,
 
-    def __init__(self, content: str):
-        self.content = content
+    @property
+    def content(self) -> str:
+        return self.__content
 
     def append_to_element(self, element: Xml.Element):
-        sub = Xml.SubElement(element, 'text')
+        sub = _sub_element(element, 'text')
         sub.text = self.content
 
+    def write_xml(self, fp: IO[bytes]):
+        fp.write(f'<text>{escape(self.content or "")}</text>'.encode('utf-8'))
+
     @staticmethod
     def parse_xml_element(element: Xml.Element) -> 'Text':
-        if _get_simple_tag_name(element) != 'text':
+        if element.tag != _TAG_TEXT:
             raise TypeError(f'Unexpected tag {_get_simple_tag_name(element)}')
 
         return Text(element.text)
 
     def __hash__(self):
-        return hash(self.content) * 31
+        h = self._hash
+        if h is None:
+            h = self._hash = hash(self.content) * 31
+        return h
 
     def __eq__(self, other):
-        return isinstance(other, Text) and other.content == self.content
+        return self is other or isinstance(other, Text) and other.content == self.content
 
 
 class Image(ArchiveFrame):
     """
     Abstraction of an image frame.
     """
-    filename: str
-    width: int
-    height: int
-    alt_text: str | None
+    __slots__ = ('__filename', '__width', '__width_s', '__height', '__height_s', '__alt_text', '_hash')
+    __filename: str
+    __width: int
+    __width_s: str
+    __height: int
+    __height_s: str
+    __alt_text: str | None
+    _hash: int | None
+
+    @property
+    def filename(self) -> str:
+        return self.__filename
+
+    @filename.setter
+    def filename(self, value: str):
+        self.__filename = value
+        self._hash = None
+
+    @property
+    def alt_text(self) -> str | None:
+        return self.__alt_text
+
+    @alt_text.setter
+    def alt_text(self, value: str | None):
+        self.__alt_text = value
+        self._hash = None
+
+    @property
+    def width(self) -> int:
+        return self.__width
+
+    @width.setter
+    def width(self, value: int):
+        self.__width = value
+        self.__width_s = str(value)
+        self._hash = None
+
+    @property
+    def height(self) -> int:
+        return self.__height
+
+    @height.setter
+    def height(self, value: int):
+        self.__height = value
+        self.__height_s = str(value)
+        self._hash = None
 
     def __init__(self, filename: str, width: int, height: int, alt_text: str | None = None):
         self.filename = filename
         self.width = width
         self.height = height
         self.alt_text = alt_text
+        self._hash = None
+
+    def __get_attrib(self) -> dict[str, str]:
+        attrib = {'src': self.__filename, 'width': self.__width_s, 'height': self.__height_s}
+        if self.__alt_text:
+            attrib['alt'] = self.__alt_text
+        return attrib
 
     def append_to_element(self, element: Xml.Element):
-        sub = Xml.SubElement(element, 'image',
-                             attrib={'src': self.filename, 'width': str(self.width), 'height': str(self.height)})
-        if self.alt_text:
-            sub.attrib['alt'] = self.alt_text
+        _sub_element(element, 'image', self.__get_attrib())
+
+    def write_xml(self, fp: IO[bytes]):
+        fp.write(_format_start_tag('image', self.__get_attrib(), empty=True).encode('utf-8'))
 
     @staticmethod
     def parse_xml_element(element: Xml.Element) -> 'Image':
-        if _get_simple_tag_name(element) != 'image':
+        if element.tag != _TAG_IMAGE:
             raise TypeError(f'Unexpected tag {_get_simple_tag_name(element)}')
 
         return Image(
             filename=_get_attribute_safe(element, 'src'),
             width=_get_attribute_safe(element, 'width', int),
             height=_get_attribute_safe(element, 'height', int),
-            alt_text=element.attrib['alt'] if 'alt' in element.attrib else None
+            alt_text=element.get('alt')
         )
 
     def __hash__(self):
-        return hash(self.alt_text) * 31 + hash(self.filename) * 31 + hash(self.width * 31 + self.height) * 31
+        h = self._hash
+        if h is None:
+            h = self._hash = hash(self.alt_text) * 31 + hash(self.filename) * 31 \
+                             + hash(self.width * 31 + self.height) * 31
+        return h
 
     def __eq__(self, other):
         return isinstance(other, Image) and other.width == self.width \
@@ -122,45 +252,90 @@ class Image(ArchiveFrame):
 class OptionItem:
     """
     Abstraction of a selectable option item.
+    Its hash covers the content frame's, so don't modify the content
+    frame in place once the item is hashed; assign a new one instead.
     """
-    is_key: bool
-    """
-    True if this option is one of or the only correct ones.
-    """
-    priority: int
-    """
-    How this option is ranked. Options with the same priority
-    will be shuffled randomly, while ones of higher priority (smaller value)
-    will be ranked ascent.
-    """
-    content: ArchiveFrame
+    __slots__ = ('__content', '__is_key', '__priority', '__priority_s', '_hash')
+    __is_key: bool
+    __priority: int
+    __priority_s: str
+    __content: ArchiveFrame
+    _hash: int | None
+
+    @property
+    def content(self) -> ArchiveFrame:
+        return self.__content
+
+    @content.setter
+    def content(self, value: ArchiveFrame):
+        self.__content = value
+        self._hash = None
+
+    @property
+    def is_key(self) -> bool:
+        """
+        True if this option is one of or the only correct ones.
+        """
+        return self.__is_key
+
+    @is_key.setter
+    def is_key(self, value: bool):
+        self.__is_key = value
+        self._hash = None
+
+    @property
+    def priority(self) -> int:
+        """
+        How this option is ranked. Options with the same priority
+        will be shuffled randomly, while ones of higher priority (smaller value)
+        will be ranked ascent.
+        """
+        return self.__priority
+
+    @priority.setter
+    def priority(self, value: int):
+        self.__priority = value
+        self.__priority_s = str(value)
+        self._hash = None
 
     def __init__(self, content: ArchiveFrame, is_key: bool = False, priority: int = 0):
         self.content = content
         self.is_key = is_key
         self.priority = priority
+        self._hash = None
+
+    def __get_attrib(self) -> dict[str, str]:
+        attrib = {'priority': self.__priority_s}
+        if self.__is_key:
+            attrib['key'] = 'true'
+        return attrib
 
     def append_to_element(self, element: Xml.Element):
-        sub = Xml.SubElement(element, 'item', attrib={'priority': str(self.priority)})
-        if self.is_key:
-            sub.attrib['key'] = 'true'
-        self.content.append_to_element(sub)
+        self.content.append_to_element(_sub_element(element, 'item', self.__get_attrib()))
+
+    def write_xml(self, fp: IO[bytes]):
+        fp.write(_format_start_tag('item', self.__get_attrib()).encode('utf-8'))
+        self.content.write_xml(fp)
+        fp.write(b'</item>')
 
     @staticmethod
     def parse_xml_element(element: Xml.Element) -> 'OptionItem':
-        if _get_simple_tag_name(element) != 'item':
+        if element.tag != _TAG_ITEM:
             raise TypeError(f'Unexpected tag {_get_simple_tag_name(element)}')
         if len(element) != 1:
             raise TypeError(f'Unexpected {len(element)} children tag')
 
         return OptionItem(
             content=ArchiveFrame.parse_xml_element(element[0]),
-            is_key='key' in element.attrib and element.attrib['key'] == 'true',
+            is_key=element.get('key') == 'true',
             priority=_get_attribute_safe(element, 'priority', int)
         )
 
     def __hash__(self):
-        return hash(self.is_key) * 31 + self.priority * 31 + hash(self.content)
+        h = self._hash
+        if h is None:
+            h = self._hash = hash(self.is_key) * 31 + self.priority * 31 + hash(self.content)
+        return h
 
     def __eq__(self, other):
         return isinstance(other, OptionItem) and other.content == self.content \
@@ -171,31 +346,67 @@ class OptionItem:
 class Options(ArchiveFrame):
     """
     Abstraction of an options frame, composed of OptionItem.
+    The items are fixed on construction.
     """
-    content: set[OptionItem]
-    name: str | None
+    __slots__ = ('__content', '__items', '__name', '_hash')
+    __content: frozenset[OptionItem]
+    __items: tuple[OptionItem, ...]
+    __name: str | None
+    _hash: int | None
+
+    def __init__(self, content: Iterable[OptionItem], name: str | None = None):
+        self.__items = tuple(sorted(dict.fromkeys(content), key=lambda item: item.priority))
+        self.__content = frozenset(self.__items)
+        self.__name = name
+        self._hash = None
 
-    def __init__(self, content: set[OptionItem] | list[OptionItem], name: str | None = None):
-        self.content = content if isinstance(content, set) else set(content)
-        self.name = name
+    @property
+    def content(self) -> frozenset[OptionItem]:
+        return self.__content
+
+    @property
+    def name(self) -> str | None:
+        return self.__name
+
+    @name.setter
+    def name(self, value: str | None):
+        self.__name = value
+        self._hash = None
+
+    @property
+    def items(self) -> tuple[OptionItem, ...]:
+        """
+        Distinct option items in the order they are written, ranked
+        by priority and then by the order they were given in.
+        """
+        return self.__items
 
     def append_to_element(self, element: Xml.Element):
-        sub = Xml.SubElement(element, 'options')
-        for item in self.content:
+        sub = _sub_element(element, 'options')
+        for item in self.__items:
             item.append_to_element(sub)
 
+    def write_xml(self, fp: IO[bytes]):
+        fp.write(b'<options>')
+        for item in self.__items:
+            item.write_xml(fp)
+        fp.write(b'</options>')
+
     @staticmethod
     def parse_xml_element(element: Xml.Element) -> 'ArchiveFrame':
-        if _get_simple_tag_name(element) != 'options':
+        if element.tag != _TAG_OPTIONS:
             raise TypeError(f'Unexpected tag {_get_simple_tag_name(element)}')
 
         return Options(
-            content=list(OptionItem.parse_xml_element(e) for e in element if _get_simple_tag_name(e) == 'item'),
-            name=element.attrib['name'] if 'name' in element.attrib else None
+            content=[OptionItem.parse_xml_element(e) for e in element if e.tag == _TAG_ITEM],
+            name=element.get('name')
         )
 
     def __hash__(self):
-        return hash(self.content) * 31 + hash(self.name)
+        h = self._hash
+        if h is None:
+            h = self._hash = hash((self.name, self.content))
+        return h
 
     def __eq__(self, other):
         return isinstance(other, Options) \
@@ -203,12 +414,30 @@ class Options(ArchiveFrame):
             and other.name == self.name
 
 
+_FRAME_PARSERS: dict[str, Callable[[Xml.Element], ArchiveFrame]] = {
+    _TAG_TEXT: Text.parse_xml_element,
+    _TAG_IMAGE: Image.parse_xml_element,
+    _TAG_OPTIONS: Options.parse_xml_element,
+}
+
+
 class Dimension:
     """
     What knowledge point a question is related to and how much so.
     """
-    name: str
+    __slots__ = ('__name', '__intensity', '_hash')
+    __name: str
     __intensity: float
+    _hash: int | None
+
+    @property
+    def name(self) -> str:
+        return self.__name
+
+    @name.setter
+    def name(self, value: str):
+        self.__name = value
+        self._hash = None
 
     @property
     def intensity(self):
@@ -224,20 +453,27 @@ class Dimension:
         if value > 1 or value <= 0:
             raise ValueError('intensity must fall in range of (0, 1]')
         self.__intensity = value
+        self._hash = None
 
     def append_to_element(self, element: Xml.Element):
-        sub = Xml.SubElement(element, 'dimension', attrib={'name': self.name})
+        sub = _sub_element(element, 'dimension', {'name': self.name})
         sub.text = str(self.intensity)
 
+    def write_xml(self, fp: IO[bytes]):
+        fp.write(f'<dimension name={quoteattr(self.name)}>{self.__intensity}</dimension>'.encode('utf-8'))
+
     def __init__(self, name: str, intensity: float):
         self.name = name
         self.intensity = intensity
 
     def __hash__(self):
-        return hash(self.name) * 31 + hash(self.__intensity)
+        h = self._hash
+        if h is None:
+            h = self._hash = hash(self.name) * 31 + hash(self.__intensity)
+        return h
 
     def __eq__(self, other):
-        return isinstance(other, Dimension) \
+        return self is other or isinstance(other, Dimension) \
             and other.name == self.name \
             and other.__intensity == self.__intensity
 
@@ -246,7 +482,7 @@ class Dimension:
 
     @staticmethod
     def parse_xml_element(element: Xml.Element) -> 'Dimension':
-        if _get_simple_tag_name(element) != 'dimension':
+        if element.tag != _TAG_DIMENSION:
             raise TypeError(f'Unexpected tag {_get_simple_tag_name(element)}')
 
         return Dimension(
@@ -264,6 +500,7 @@ class Quiz:
     handles the answers and recommendations, not how the user interacts
     with the interface.
     """
+    __slots__ = ('name', 'creation_time', 'modification_time', 'frames', 'dimensions')
     name: str | None
     creation_time: datetime
     modification_time: datetime | None
@@ -278,45 +515,87 @@ class Quiz:
         self.frames = frames
         self.dimensions = dimensions if isinstance(dimensions, set) else set(dimensions)
 
-    def append_to_element(self, element: Xml.Element):
-        sub = Xml.SubElement(element, 'quiz',
-                             attrib={'creation': self.creation_time.isoformat()})
+    def __get_attrib(self) -> dict[str, str]:
+        creation = self.creation_time.isoformat()
+        attrib = {'creation': creation}
         if self.name:
-            sub.attrib['name'] = self.name
+            attrib['name'] = self.name
         if self.modification_time:
-            sub.attrib['modification'] = self.modification_time.isoformat()
-
-        frames_element = Xml.SubElement(sub, 'frames')
+            attrib['modification'] = creation if self.modification_time is self.creation_time \
+                or self.modification_time == self.creation_time \
+                and self.modification_time.utcoffset() == self.creation_time.utcoffset() \
+                else self.modification_time.isoformat()
+        return attrib
+
+    def __append_children(self, element: Xml.Element):
+        frames_element = _sub_element(element, 'frames')
         for frame in self.frames:
             frame.append_to_element(frames_element)
 
         for dimension in self.dimensions:
-            dimension.append_to_element(sub)
+            dimension.append_to_element(element)
+
+    def append_to_element(self, element: Xml.Element):
+        self.__append_children(_sub_element(element, 'quiz', self.__get_attrib()))
+
+    def write_xml(self, fp: IO[bytes]):
+        """
+        Serialize the quiz element into a stream without building an XML hierarchy.
+        :param fp: The binary stream to write to.
+        """
+        fp.write(_format_start_tag('quiz', self.__get_attrib()).encode('utf-8'))
+        fp.write(b'<frames>')
+        for frame in self.frames:
+            frame.write_xml(fp)
+        fp.write(b'</frames>')
+        for dimension in self.dimensions:
+            dimension.write_xml(fp)
+        fp.write(b'</quiz>')
+
+    def to_xml_string(self) -> str:
+        """
+        Convert to a standalone XML snippet, without declaration or namespace.
+        :return: The quiz element as a string.
+        """
+        buffer = BytesIO()
+        self.write_xml(buffer)
+        return buffer.getvalue().decode('utf-8')
 
     @staticmethod
     def parse_xml_element(element: Xml.Element) -> 'Quiz':
-        if _get_simple_tag_name(element) != 'quiz':
+        if element.tag != _TAG_QUIZ:
             raise TypeError(f'Unexpected tag {_get_simple_tag_name(element)}')
 
-        frames_iter = (e for e in element if _get_simple_tag_name(e) == 'frames')
-        try:
-            frames_element = next(frames_iter)
-        except StopIteration:
+        frames_element = None
+        dimensions_list = []
+        for child in element:
+            tag = child.tag
+            if tag == _TAG_FRAMES:
+                if frames_element is not None:
+                    raise TypeError('Unexpected multi-frames-children tag')
+                frames_element = child
+            elif tag == _TAG_DIMENSION:
+                dimensions_list.append(Dimension.parse_xml_element(child))
+
+        if frames_element is None:
             raise TypeError('Expected one frames child, got none')
 
-        try:
-            next(frames_iter)
-            raise TypeError('Unexpected multi-frames-children tag')
-        except StopIteration:
-            pass
+        creation = _get_attribute_safe(element, 'creation')
+        creation_time = datetime.fromisoformat(creation)
+        modification = element.get('modification')
+        if modification is None:
+            modification_time = None
+        elif modification == creation:
+            modification_time = creation_time
+        else:
+            modification_time = datetime.fromisoformat(modification)
 
         return Quiz(
-            name=element.attrib['name'] if 'name' in element.attrib else None,
-            creation_time=_get_attribute_safe(element, 'creation', datetime.fromisoformat),
-            modification_time=datetime.fromisoformat(
-                element.attrib['modification']) if 'modification' in element.attrib else None,
-            dimensions=list(Dimension.parse_xml_element(e) for e in element if _get_simple_tag_name(e) == 'dimension'),
-            frames=list(ArchiveFrame.parse_xml_element(e) for e in frames_element)
+            name=element.get('name'),
+            creation_time=creation_time,
+            modification_time=modification_time,
+            dimensions=dimensions_list,
+            frames=[ArchiveFrame.parse_xml_element(e) for e in frames_element]
         )
 
     def __eq__(self, other):
@@ -359,38 +638,53 @@ class QuizContainer:
 
     def to_xml_element(self) -> Xml.Element:
         """
-        Convert to an XML hierarchy.
+        Convert to an XML hierarchy, built with lxml if USE_LXML is set.
         :return: XML hierarchy where the root element represents the archive.
         """
-        doc = Xml.Element('archive', attrib={'xmlns': NAMESPACE,
-                                             'creation': self.creation_time.isoformat()})
+        if _etree() is Xml:
+            doc = Xml.Element('archive', attrib={'xmlns': NAMESPACE,
+                                                 'creation': self.creation_time.isoformat()})
+        else:
+            doc = _LXml.Element(_TAG_ARCHIVE, attrib={'creation': self.creation_time.isoformat()},
+                                nsmap={None: NAMESPACE})
         for quiz in self.content:
             quiz.append_to_element(doc)
         return doc
 
+    def write_xml(self, fp: IO[bytes]):
+        """
+        Serialize the XML document into a stream, one element at a time,
+        without building an XML hierarchy first.
+        :param fp: The binary stream to write to.
+        """
+        fp.write(b"<?xml version='1.0' encoding='utf-8'?>\n")
+        fp.write(_format_start_tag('archive', {'xmlns': NAMESPACE,
+                                               'creation': self.creation_time.isoformat()}).encode('utf-8'))
+        for quiz in self.content:
+            quiz.write_xml(fp)
+        fp.write(b'</archive>')
+
     def to_bytes(self) -> bytes:
         """
         Convert to a byte array, which once gzipped is ready
         to be imported by Practiso.
         :return: A byte array representing the archive.
         """
-        ele = self.to_xml_element()
-        xml_bytes = Xml.tostring(ele, xml_declaration=True, encoding='utf-8')
+        buffer = BytesIO()
+        self.write_xml(buffer)
         if len(self.resources) <= 0:
-            return xml_bytes
+            return buffer.getvalue()
 
-        buffer = bytearray()
-        buffer.extend(xml_bytes)
-        buffer.append(0)
+        buffer.write(b'\0')
         for (name, content) in self.resources.items():
-            buffer.extend(name.encode('utf-8'))
-            buffer.append(0)
+            buffer.write(name.encode('utf-8'))
+            buffer.write(b'\0')
             cb = content.read()
             content.seek(0)
-            buffer.extend(len(cb).to_bytes(4))
-            buffer.extend(cb)
+            buffer.write(len(cb).to_bytes(4))
+            buffer.write(cb)
 
-        return buffer
+        return buffer.getvalue()
 
     def __eq__(self, other):
         return isinstance(other, QuizContainer) \
@@ -404,12 +698,59 @@ class QuizContainer:
         :param element: The XML hierarchy to be parsed.
         :return: The quiz composite.
         """
-        if _get_simple_tag_name(element) != 'archive':
+        if element.tag != _TAG_ARCHIVE:
             raise TypeError(f'Unexpected tag {_get_simple_tag_name(element)}')
 
+        quiz_elements = [e for e in element if e.tag == _TAG_QUIZ]
+        if _PARALLEL_PARSING and len(quiz_elements) > 32:
+            with ThreadPoolExecutor() as executor:
+                content = list(executor.map(Quiz.parse_xml_element, quiz_elements))
+        else:
+            content = [Quiz.parse_xml_element(e) for e in quiz_elements]
+
         return QuizContainer(
             creation_time=_get_attribute_safe(element, 'creation', datetime.fromisoformat),
-            content=list(Quiz.parse_xml_element(e) for e in element if _get_simple_tag_name(e) == 'quiz')
+            content=content
+        )
+
+    @staticmethod
+    def parse_stream(fp: IO) -> 'QuizContainer':
+        """
+        Convert an XML stream to a comprehensible quiz composite.
+        Quizzes are parsed as soon as they are closed and dropped
+        from the hierarchy afterwards, so only one of them resides
+        in memory at a time.
+        :param fp: The stream to read.
+        :return: The quiz composite.
+        """
+        root = None
+        depth = 0
+        content = []
+        if _etree() is Xml:
+            events = Xml.iterparse(fp, events=('start', 'end'))
+        else:
+            # unlike the standard library, lxml keeps comments and processing instructions
+            events = _LXml.iterparse(fp, events=('start', 'end'), remove_comments=True, remove_pis=True)
+        for event, element in events:
+            if event == 'start':
+                if root is None:
+                    if element.tag != _TAG_ARCHIVE:
+                        raise TypeError(f'Unexpected tag {_get_simple_tag_name(element)}')
+                    root = element
+                depth += 1
+                continue
+
+            depth -= 1
+            if depth != 1:
+                continue
+            if element.tag == _TAG_QUIZ:
+                content.append(Quiz.parse_xml_element(element))
+            element.clear()
+            root.remove(element)
+
+        return QuizContainer(
+            creation_time=_get_attribute_safe(root, 'creation', datetime.fromisoformat),
+            content=content
         )
 
 
@@ -425,10 +766,7 @@ def open(fp: IO) -> 'QuizContainer':
     except ValueError:
         i = len(content)
 
-    tree = Xml.ElementTree()
-    tree.parse(source=BytesIO(content[:i]))
-
-    container = QuizContainer.parse_xml_element(tree.getroot())
+    container = QuizContainer.parse_stream(BytesIO(content[:i]))
     head = i + 1
     while head < len(content):
         i = content.index(0, head)
@@ -227,7 +227,7 @@ class Builder:
         after end_options is called.
         :param name: caption of the frame
         """
-        self.__staging_stack.append(Options(set(), name))
+        self.__staging_stack.append(Options((), name))
         return self
 
     def end_options(self) -> 'Builder':
@@ -257,7 +257,8 @@ class Builder:
         if type(e) == ArchiveFrame:
             raise ValueError('Empty option item')
 
-        self.__get_staged_peak_safe([Options]).content.add(e)
+        options: Options = self.__get_staged_peak_safe([Options])
+        self.__staging_stack[-1] = Options((*options.items, e), options.name)
 
         return self
 
@@ -1,5 +1,5 @@
 import json
-import xml.etree.ElementTree as ElementTree
+from typing import Any
 
 import google.generativeai as genai
 from google.ai.generativelanguage_v1beta.types import content
@@ -7,19 +7,54 @@ from google.ai.generativelanguage_v1beta.types import content
 from practiso_sdk.archive import Quiz, Dimension
 from practiso_sdk.build import VectorizeAgent, RetriableError
 
+_configured_api_key: str | None = None
+
+
+def _configure(api_key: str):
+    global _configured_api_key
+    if _configured_api_key != api_key:
+        genai.configure(api_key=api_key)
+        _configured_api_key = api_key
+
+
+def _parse_dimensions_safe(dims: Any) -> set[Dimension]:
+    if not isinstance(dims, list) or not all(
+            isinstance(dim, dict) \
+            and isinstance(dim.get('name'), str) and isinstance(dim.get('intensity'), float) \
+            for dim in dims):
+        raise RetriableError('invalid response format')
+    try:
+        return set(Dimension(dim['name'], dim['intensity']) for dim in dims)
+    except ValueError as e:
+        raise RetriableError(str(e))
+
 
 def get_dimension_from_ai_safe(text: str) -> set[Dimension]:
+    """
+    Parse a single-quiz response in the form of {"dimensions": [...]}.
+    """
     try:
         response_content = json.loads(text)
     except json.JSONDecodeError:
         raise RetriableError('invalid json format')
-    if 'dimensions' not in response_content or not all(
-            'name' in dim and 'intensity' in dim \
-            and isinstance(dim['name'], str) and isinstance(dim['intensity'], float) \
-            for dim in response_content['dimensions']):
+    if not isinstance(response_content, dict):
         raise RetriableError('invalid response format')
 
-    return set(Dimension(dim['name'], dim['intensity']) for dim in response_content['dimensions'])
+    return _parse_dimensions_safe(response_content.get('dimensions'))
+
+
+def get_dimensions_from_ai_safe(text: str, size: int) -> list[set[Dimension]]:
+    try:
+        response_content = json.loads(text)
+    except json.JSONDecodeError:
+        raise RetriableError('invalid json format')
+    if not isinstance(response_content, dict) or not isinstance(response_content.get('results'), list):
+        raise RetriableError('invalid response format')
+    results = response_content['results']
+    if len(results) != size:
+        raise RetriableError(f'expected {size} results, got {len(results)}')
+
+    return [_parse_dimensions_safe(dims) for dims in results]
 
 
 class GeminiAgent(VectorizeAgent):
@@ -27,66 +62,106 @@ class GeminiAgent(VectorizeAgent):
     Uses Gemini flash to determine dimensions of questions.
     """
     __api_key: str
-    __model: genai.GenerativeModel
+    __temperature: float
+    __top_p: float
+    __top_k: float
+    __max_batch_size: int
+    __model: genai.GenerativeModel | None
 
-    def __init__(self, api_key: str, temperature: float = 0, top_p: float = 0.95, top_k: float = 40):
+    def __init__(self, api_key: str, temperature: float = 0, top_p: float = 0.95, top_k: float = 40,
+                 max_batch_size: int = 16):
+        """
+        Initialize a Gemini agent.
+        :param api_key: Gemini API key.
+        :param max_batch_size: How many quizzes are sent in one request at most. All results
+        of a request share one 8192-token output limit, so larger batches risk a truncated response.
+        """
+        if max_batch_size < 1:
+            raise ValueError('max_batch_size must be positive')
         self.__api_key = api_key
-        # noinspection PyTypeChecker
-        self.__model = genai.GenerativeModel(
-            model_name="gemini-2.0-flash-exp",
-            generation_config={
-                'temperature': temperature,
-                'top_p': top_p,
-                'top_k': top_k,
-                'max_output_tokens': 8192,
-                'response_schema': content.Schema(
-                    type=content.Type.OBJECT,
-                    enum=[],
-                    required=['dimensions'],
-                    properties={
-                        'dimensions': content.Schema(
-                            type=content.Type.ARRAY,
-                            items=content.Schema(
-                                type=content.Type.OBJECT,
-                                enum=[],
-                                required=['name', 'intensity'],
-                                properties={
-                                    'name': content.Schema(
-                                        type=content.Type.STRING,
-                                    ),
-                                    'intensity': content.Schema(
-                                        type=content.Type.NUMBER,
+        self.__temperature = temperature
+        self.__top_p = top_p
+        self.__top_k = top_k
+        self.__max_batch_size = max_batch_size
+        self.__model = None
+
+    def __get_model(self) -> genai.GenerativeModel:
+        if self.__model is None:
+            # noinspection PyTypeChecker
+            self.__model = genai.GenerativeModel(
+                model_name="gemini-2.0-flash-exp",
+                generation_config={
+                    'temperature': self.__temperature,
+                    'top_p': self.__top_p,
+                    'top_k': self.__top_k,
+                    'max_output_tokens': 8192,
+                    'response_schema': content.Schema(
+                        type=content.Type.OBJECT,
+                        enum=[],
+                        required=['results'],
+                        properties={
+                            'results': content.Schema(
+                                type=content.Type.ARRAY,
+                                items=content.Schema(
+                                    type=content.Type.ARRAY,
+                                    items=content.Schema(
+                                        type=content.Type.OBJECT,
+                                        enum=[],
+                                        required=['name', 'intensity'],
+                                        properties={
+                                            'name': content.Schema(
+                                                type=content.Type.STRING,
+                                            ),
+                                            'intensity': content.Schema(
+                                                type=content.Type.NUMBER,
+                                            ),
+                                        },
                                     ),
-                                },
+                                ),
                             ),
-                        ),
-                    },
-                ),
-                'response_mime_type': 'application/json',
-            },
-            system_instruction='You are a student tagging quizzes from your collections. '
-                               'You always look at the XML presentation of a quiz and '
-                               'determine what category the quiz falls into and how much '
-                               'so, rating the intensity from 0 to 1. You always name the '
-                               'category in the language the quiz is written in, and break '
-                               'the categories into several small knowledge points. '
-                               'Here comes your first quiz.',
-        )
+                        },
+                    ),
+                    'response_mime_type': 'application/json',
+                },
+                system_instruction='You are a student tagging quizzes from your collections. '
+                                   'You always look at the XML presentation of a batch of quizzes '
+                                   'and determine, for each quiz in order, what category it '
+                                   'falls into and how much so, rating the intensity from 0 to 1. '
+                                   'You always answer with exactly one result per quiz. '
+                                   'You always name the category in the language the quiz is '
+                                   'written in, and break the categories into several small '
+                                   'knowledge points. Here comes your first batch.',
+            )
+        return self.__model
 
     async def get_dimensions(self, quiz: Quiz) -> set[Dimension]:
-        genai.configure(api_key=self.__api_key)
+        return (await self.get_dimensions_batch([quiz]))[0]
 
-        container = ElementTree.Element('container')
-        quiz.append_to_element(container)
-        quiz_xml = str(ElementTree.tostring(container[0], encoding='utf-8', xml_declaration=False))
+    async def get_dimensions_batch(self, quizzes: list[Quiz]) -> list[set[Dimension]]:
+        """
+        Determine dimensions of several quizzes, sending at most max_batch_size
+        of them per request, one request after another.
+        Throws RetriableError if a response is malformed or doesn't
+        cover every quiz of its batch.
+        :param quizzes: The quizzes to be tagged.
+        :return: Dimensions of each quiz, in the same order as the quizzes.
+        """
+        results = []
+        for head in range(0, len(quizzes), self.__max_batch_size):
+            results += await self.__request_dimensions(quizzes[head:head + self.__max_batch_size])
+        return results
 
+    async def __request_dimensions(self, quizzes: list[Quiz]) -> list[set[Dimension]]:
         quiz_content = content.Content()
         quiz_content.role = 'user'
         xml_part = content.Part()
-        xml_part.text = quiz_xml
+        xml_part.text = '<batch>' + ''.join(quiz.to_xml_string() for quiz in quizzes) + '</batch>'
         quiz_content.parts = [xml_part]
 
-        chat_session = self.__model.start_chat(history=[quiz_content])
+        # the model binds to the globally configured client on its first request,
+        # so only switch keys when another agent has configured its own
+        _configure(self.__api_key)
+        chat_session = self.__get_model().start_chat(history=[quiz_content])
         response = await chat_session.send_message_async("INSERT_INPUT_HERE")
 
-        return get_dimension_from_ai_safe(response.text)
+        return get_dimensions_from_ai_safe(response.text, len(quizzes))
@@ -1,4 +1,8 @@
+import copy
+import pickle
 import unittest
+import unittest.mock
+from datetime import datetime, timedelta, timezone
 from io import BytesIO
 from xml.etree.ElementTree import ElementTree
 
@@ -46,6 +50,86 @@ class ArchiveTestCase(unittest.TestCase):
         parsed = archive.open(BytesIO(xml_bytes))
         self.assertEqual(parsed, self.sample_quiz_set)
 
+    def test_should_parse_stream(self):
+        xml_bytes = self.sample_quiz_set.to_bytes()
+        parsed = archive.QuizContainer.parse_stream(BytesIO(xml_bytes))
+        self.assertEqual(parsed, self.sample_quiz_set)
+
+    def test_should_write_as_built(self):
+        from xml.etree.ElementTree import canonicalize, tostring
+        built = tostring(self.sample_quiz_set.to_xml_element(), encoding='unicode')
+        written = self.sample_quiz_set.to_bytes().decode('utf-8')
+        self.assertEqual(canonicalize(written), canonicalize(built))
+
+    @unittest.mock.patch.object(archive, '_PARALLEL_PARSING', True)
+    def test_should_parse_in_parallel(self):
+        container = archive.QuizContainer(content=[
+            archive.Quiz(name=f'Quiz {i}', frames=[archive.Text(f'Text {i}')], dimensions=[])
+            for i in range(64)
+        ])
+        tree = ElementTree()
+        tree.parse(source=BytesIO(container.to_bytes()))
+        self.assertEqual(archive.QuizContainer.parse_xml_element(tree.getroot()), container)
+
+    def test_should_keep_modification_offset(self):
+        creation_time = datetime(2025, 1, 1, tzinfo=timezone.utc)
+        modification_time = creation_time.astimezone(timezone(timedelta(hours=8)))
+        container = archive.QuizContainer(content=[archive.Quiz(
+            name=None, frames=[], dimensions=[],
+            creation_time=creation_time, modification_time=modification_time
+        )])
+        parsed = archive.open(BytesIO(container.to_bytes()))
+        self.assertEqual(parsed.content[0].modification_time.utcoffset(), timedelta(hours=8))
+
+    def test_should_copy_and_pickle(self):
+        self.assertEqual(copy.copy(self.sample_quiz_set), self.sample_quiz_set)
+        self.assertEqual(copy.deepcopy(self.sample_quiz_set), self.sample_quiz_set)
+        self.assertEqual(pickle.loads(pickle.dumps(self.sample_quiz_set)), self.sample_quiz_set)
+
+    def test_should_hash_frames(self):
+        frames = self.sample_quiz_set.content[0].frames
+        copies = archive.QuizContainer.parse_stream(BytesIO(self.sample_quiz_set.to_bytes())).content[0].frames
+        self.assertEqual(set(frames), set(copies))
+
+    def test_should_rehash_after_change(self):
+        image = archive.Image(filename='', width=0, height=0)
+        frames = {image}
+        image.filename = 'cat_walker.jpg'
+        self.assertEqual(hash(image), hash(archive.Image(filename='cat_walker.jpg', width=0, height=0)))
+        self.assertNotIn(image, frames)
+
+    def test_should_write_options_in_order(self):
+        items = [archive.OptionItem(archive.Text(f'Option {i}'), priority=i % 2) for i in range(8)]
+        options = archive.Options(items)
+        self.assertEqual(options.items, tuple(items[0::2] + items[1::2]))
+
+    def test_should_keep_dimensions_apart(self):
+        container = archive.QuizContainer(content=[
+            archive.Quiz(name=None, frames=[], dimensions=[archive.Dimension('alg', 0.5)]) for _ in range(2)
+        ])
+        q1, q2 = archive.open(BytesIO(container.to_bytes())).content
+        next(iter(q1.dimensions)).intensity = 0.9
+        self.assertIn(archive.Dimension('alg', 0.5), q2.dimensions)
+
+    @unittest.skipIf(archive._LXml is None, 'lxml is not installed')
+    def test_should_archive_with_lxml(self):
+        archive.USE_LXML = True
+        try:
+            parsed = archive.open(BytesIO(self.sample_quiz_set.to_bytes()))
+        finally:
+            archive.USE_LXML = False
+        self.assertEqual(parsed, self.sample_quiz_set)
+
+    @unittest.skipIf(archive._LXml is None, 'lxml is not installed')
+    def test_should_skip_comments_with_lxml(self):
+        xml_bytes = self.sample_quiz_set.to_bytes().replace(b'<frames>', b'<frames><!-- note --><?pi?>')
+        archive.USE_LXML = True
+        try:
+            parsed = archive.QuizContainer.parse_stream(BytesIO(xml_bytes))
+        finally:
+            archive.USE_LXML = False
+        self.assertEqual(parsed, self.sample_quiz_set)
+
 
 if __name__ == '__main__':
     unittest.main()